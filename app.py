@@ -1,15 +1,36 @@
 # app.py  — minimal, TypeError-proof Streamlit app
+import logging
+
 import streamlit as st
 from src.router import handle_turn  # must return a string
+from src.router.capture import warm_caches
 
 st.set_page_config(page_title="GUVI Multilingual GPT Chatbot", page_icon="🤖")
 
+
+@st.cache_resource
+def _warm_caches_once() -> int:
+    # pre-warm the answer cache from CAPTURE_WARM_REPORT (no-op if unset)
+    try:
+        return warm_caches()
+    except Exception:
+        logging.getLogger(__name__).warning(
+            "Could not warm caches from CAPTURE_WARM_REPORT", exc_info=True
+        )
+        return 0
+
+_warm_caches_once()
+
 # --- sidebar --------------------------------------------------------------
 st.sidebar.header("Settings")
 domain_mode = st.sidebar.selectbox(
     "Domain mode", ["general", "technical", "educational", "friendly"], index=0
 )
 
+profile_turns = st.sidebar.toggle(
+    "Profile turns", value=False, help="Write a flamegraph dump for each reply"
+)
+
 with st.sidebar.expander("Examples", expanded=False):
     st.markdown(
         "- general: *What's the capital of Japan?*\n"
@@ -45,7 +66,9 @@ if user_text:
     # get assistant reply safely
     try:
         with st.spinner("Thinking & translating…"):
-            reply = handle_turn(user_text, domain_role=_safe_str(domain_mode))
+            reply = handle_turn(
+                user_text, domain_role=_safe_str(domain_mode), profile=profile_turns
+            )
         reply = _safe_str(reply).strip()
         if not reply:
             reply = "⚠️ Sorry—no response."
@@ -32,6 +32,22 @@ class _Settings:
     MAX_TOKENS: int = int(os.getenv("MAX_TOKENS", "512"))
     TIMEOUT_S: int = int(os.getenv("LLM_TIMEOUT_S", "30"))
 
+    # Per-turn profiling (opt-in; see src/router/profiling.py)
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # 0.0 - 1.0
+    PROFILE_MODE: str = os.getenv("PROFILE_MODE", "sample")          # sample | deterministic
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+    # Traffic capture (opt-in; see src/router/capture.py)
+    CAPTURE_ENABLED: bool = os.getenv("CAPTURE_ENABLED", "0").lower() in {"1", "true", "yes"}
+    CAPTURE_STORE_TEXT: bool = os.getenv("CAPTURE_STORE_TEXT", "0").lower() in {"1", "true", "yes"}
+    CAPTURE_HASH_KEY: str = os.getenv("CAPTURE_HASH_KEY", "")  # HMAC key for text hashes; random per process if unset
+    CAPTURE_PATH: str = os.getenv("CAPTURE_PATH", "captures/turns.jsonl")
+    CAPTURE_MAX_BYTES: int = int(os.getenv("CAPTURE_MAX_BYTES", str(5 * 1024 * 1024)))
+    CAPTURE_BACKUPS: int = int(os.getenv("CAPTURE_BACKUPS", "5"))
+    CAPTURE_WARM_REPORT: str = os.getenv("CAPTURE_WARM_REPORT", "")  # frequency report to pre-warm caches
+
 
 # Single shared instance imported by the app
 settings = _Settings()
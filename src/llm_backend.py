@@ -13,7 +13,9 @@ Why this file?
 from __future__ import annotations
 
 import re
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 # Keep imports minimal. We don't *require* torch/transformers here.
 # If in the future you wire in a real model, do it in `_real_local_model()`.
@@ -98,41 +100,67 @@ def _real_local_model(prompt_en: str, domain_role: str) -> str:
     return "Sorry, I don't have enough information to answer that."
 
 
-def _local_generate(prompt_en: str, domain_role: str = "general") -> str:
+def _generate_uncached(prompt_en: str, domain_role: str) -> Tuple[str, str]:
     """
     Deterministic local generation:
     1) Try rule-based answers for common questions (like capitals).
     2) Fall back to a generic small-model stub.
+    Returns (answer, tier) where tier is "rules" or "model".
     """
     # 1) Rules first (prevents echoing the input like "japan")
     ruled = _rule_based_answer(prompt_en)
     if isinstance(ruled, str) and ruled.strip():
-        return ruled.strip()
+        return ruled.strip(), "rules"
 
     # 2) Fallback "model"
-    return _real_local_model(prompt_en, domain_role).strip()
+    return _real_local_model(prompt_en, domain_role).strip(), "model"
 
 
-# --- Public API ----------------------------------------------------------------
+# Small LRU of (prompt, role) -> answer. Hand-rolled rather than lru_cache so
+# each call knows whether *it* was served from the cache, even when Streamlit
+# sessions generate concurrently.
+_ANSWER_CACHE_SIZE = 1024
+_answer_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_answer_cache_lock = threading.Lock()
 
-def generate_answer(prompt: str, domain_role: str = "general") -> str:
-    """
-    Main entry used by your router.
 
-    - Input: English prompt (router already translated user text -> English).
-    - Output: English answer (router will translate back to user language).
+def _local_generate(prompt_en: str, domain_role: str = "general") -> Tuple[str, str]:
+    key = (prompt_en, domain_role)
+    with _answer_cache_lock:
+        if key in _answer_cache:
+            _answer_cache.move_to_end(key)
+            return _answer_cache[key], "cache"
 
-    Always returns a *string*. Never echoes raw non-answers like "japan".
+    answer, tier = _generate_uncached(prompt_en, domain_role)
+    with _answer_cache_lock:
+        _answer_cache[key] = answer
+        if len(_answer_cache) > _ANSWER_CACHE_SIZE:
+            _answer_cache.popitem(last=False)
+    return answer, tier
+
+
+# --- Public API ----------------------------------------------------------------
+
+def generate_answer_with_tier(prompt: str, domain_role: str = "general") -> Tuple[str, str]:
+    """
+    Like generate_answer(), but also returns which tier served the answer:
+    "cache", "rules", "model" or "error".
     """
     try:
-        answer = _local_generate(prompt or "", domain_role=domain_role)
-        return str(answer) if answer is not None else ""
+        answer, tier = _local_generate(prompt or "", domain_role=domain_role)
+        return (str(answer) if answer is not None else ""), tier
     except Exception as e:
         # Never raise to Streamlit; return a compact diagnostic the UI can show.
-        return f"[LLM error: {type(e).__name__}]"
-
-
+        return f"[LLM error: {type(e).__name__}]", "error"
 
 
+def generate_answer(prompt: str, domain_role: str = "general") -> str:
+    """
+    Main entry used by your router.
 
+    - Input: English prompt (router already translated user text -> English).
+    - Output: English answer (router will translate back to user language).
 
+    Always returns a *string*. Never echoes raw non-answers like "japan".
+    """
+    return generate_answer_with_tier(prompt, domain_role=domain_role)[0]
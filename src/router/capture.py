@@ -0,0 +1,243 @@
+# src/router/capture.py
+"""
+Opt-in traffic capture for the router.
+
+When ``CAPTURE_ENABLED`` is set, every turn appends one compact JSON line to
+``CAPTURE_PATH`` (rotated at ``CAPTURE_MAX_BYTES``, ``CAPTURE_BACKUPS`` files
+kept):
+
+    {"ts": 1760000000.123, "h": "9f2c...", "k": "a1b2c3d4", "lang": "hin_Deva",
+     "role": "general", "tier": "rules", "ms": {"translate_in": 0.4, ...}}
+
+Text is always scrubbed first: e-mails, URLs and long digit runs
+(phone/account numbers) become placeholders. By default only an HMAC of the
+scrubbed text is stored, keyed by ``CAPTURE_HASH_KEY``. If that is unset a
+random key is used for the life of the process (a warning is logged), so
+hashes only match within one run; ``k`` identifies the key so reports never
+merge hashes made with different keys. With ``CAPTURE_STORE_TEXT`` the
+scrubbed text is kept as well.
+
+Captures feed ``src/router/replay.py`` (load replay and frequency reports)
+and ``warm_caches()``, which pre-warms the answer cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import logging
+import re
+import secrets
+import threading
+from collections import Counter, defaultdict
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from src.config.settings import settings
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_URL_RE = re.compile(r"https?://\S+|www\.\S+", re.I)
+_DIGITS_RE = re.compile(r"\+?\d[\d\s-]{5,}\d")
+_ws_re = re.compile(r"\s+")
+
+_lock = threading.Lock()
+log = logging.getLogger(__name__)
+
+# The capture logger is process-wide, so state that must survive a module
+# reload (Streamlit re-imports edited sources) lives on it, not in globals.
+_CAPTURE_LOGGER = "guvi.capture"
+
+
+# ---- Utilities --------------------------------------------------------------
+def scrub(text: str) -> str:
+    """Replace e-mails, URLs and long digit runs with placeholders."""
+    text = _EMAIL_RE.sub("<email>", text)
+    text = _URL_RE.sub("<url>", text)
+    text = _DIGITS_RE.sub("<num>", text)
+    return _ws_re.sub(" ", text).strip()
+
+
+def _hash_key() -> bytes:
+    """CAPTURE_HASH_KEY, or one random key per process (kept across reloads)."""
+    if settings.CAPTURE_HASH_KEY:
+        return settings.CAPTURE_HASH_KEY.encode("utf-8")
+    holder = logging.getLogger(_CAPTURE_LOGGER)
+    with _lock:
+        key = getattr(holder, "guvi_hash_key", None)
+        if key is None:
+            key = holder.guvi_hash_key = secrets.token_bytes(32)
+    return key
+
+
+def key_id() -> str:
+    """Short, non-reversible id of the hash key, stored with each record."""
+    return hmac.new(_hash_key(), b"guvi-capture-key-id", hashlib.sha256).hexdigest()[:8]
+
+
+def text_hash(text: str) -> str:
+    """Keyed short hash of the scrubbed, case-normalized text."""
+    norm = scrub(text or "").lower()
+    return hmac.new(_hash_key(), norm.encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+
+
+def _get_logger() -> logging.Logger:
+    """
+    Dedicated logger writing bare JSON lines to a rotating file. Reuses the
+    handler already attached for CAPTURE_PATH, so a re-imported module never
+    adds a second handler for the same file.
+    """
+    logger = logging.getLogger(_CAPTURE_LOGGER)
+    path = Path(settings.CAPTURE_PATH).resolve()
+    with _lock:
+        for h in logger.handlers:
+            if isinstance(h, RotatingFileHandler) and h.baseFilename == str(path):
+                return logger
+        # Path changed (or first use): drop handlers for the old file
+        for h in list(logger.handlers):
+            logger.removeHandler(h)
+            h.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=settings.CAPTURE_MAX_BYTES,
+            backupCount=settings.CAPTURE_BACKUPS,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+    return logger
+
+
+# ---- Recording --------------------------------------------------------------
+def record_turn(
+    user_text: str,
+    lang: str,
+    domain_role: str,
+    timings: Dict[str, float],
+    tier: str,
+    ts: float,
+) -> None:
+    """Append one turn to the capture log (no-op unless CAPTURE_ENABLED)."""
+    if not settings.CAPTURE_ENABLED:
+        return
+    logger = _get_logger()
+    if not settings.CAPTURE_HASH_KEY and not getattr(logger, "guvi_key_warned", False):
+        logger.guvi_key_warned = True
+        log.warning(
+            "CAPTURE_HASH_KEY is not set; text hashes use a random per-process key "
+            "and will not match captures from other runs"
+        )
+    rec = {
+        "ts": round(ts, 3),
+        "h": text_hash(user_text),
+        "k": key_id(),
+        "lang": lang,
+        "role": domain_role,
+        "tier": tier,
+        "ms": {k: round(v, 3) for k, v in timings.items()},
+    }
+    if settings.CAPTURE_STORE_TEXT:
+        rec["text"] = scrub(user_text)
+    logger.info(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+
+
+# ---- Reading / reports ------------------------------------------------------
+def capture_files(path: Optional[str] = None) -> List[Path]:
+    """Capture file plus its rotated backups, oldest first."""
+    base = Path(path or settings.CAPTURE_PATH)
+    backups = sorted(
+        base.parent.glob(base.name + ".*"),
+        key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    return [p for p in backups + [base] if p.exists()]
+
+
+def read_capture(path: Optional[str] = None) -> Iterator[dict]:
+    """Yield capture records in chronological order, skipping corrupt lines."""
+    for file in capture_files(path):
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def frequency_report(records, top: int = 200) -> dict:
+    """
+    Summarize a capture: turn mix by language / role / tier, mean stage
+    timings, and the most frequent texts (used to pre-warm caches).
+    Texts are counted per (hash key, hash), so captures made with different
+    keys are never merged; ``hash_keys`` shows how many keys are mixed in.
+    """
+    langs, roles, tiers, keys, hashes = Counter(), Counter(), Counter(), Counter(), Counter()
+    texts: Dict[tuple, dict] = {}
+    stage_sum: Dict[str, float] = defaultdict(float)
+    stage_n: Counter = Counter()
+
+    total = 0
+    for rec in records:
+        total += 1
+        langs[rec.get("lang", "")] += 1
+        roles[rec.get("role", "")] += 1
+        tiers[rec.get("tier", "")] += 1
+        keys[rec.get("k", "")] += 1
+        key = (rec.get("k", ""), rec.get("h", ""))
+        hashes[key] += 1
+        if rec.get("text") and key not in texts:
+            texts[key] = {"text": rec["text"], "lang": rec.get("lang"), "role": rec.get("role")}
+        for stage, ms in (rec.get("ms") or {}).items():
+            stage_sum[stage] += ms
+            stage_n[stage] += 1
+
+    return {
+        "turns": total,
+        "unique_texts": len(hashes),
+        "langs": dict(langs.most_common()),
+        "roles": dict(roles.most_common()),
+        "tiers": dict(tiers.most_common()),
+        "hash_keys": dict(keys.most_common()),
+        "mean_stage_ms": {k: round(stage_sum[k] / stage_n[k], 3) for k in stage_sum},
+        "top": [
+            {"h": h, "k": k, "count": n, **texts.get((k, h), {})}
+            for (k, h), n in hashes.most_common(top)
+        ],
+    }
+
+
+# ---- Cache warming ----------------------------------------------------------
+def warm_caches(report_path: Optional[str] = None) -> int:
+    """
+    Run the most frequent captured texts through the answer cache. Entries
+    without stored text (hash-only captures) are skipped. Returns the number
+    of texts warmed.
+
+    The phrase-table translator has nothing worth caching, so translation is
+    only used here to get the English prompt; warming translations is left
+    for when a model-backed translator exists.
+    """
+    from src.translation import to_english
+    from src.llm_backend import generate_answer
+
+    path = report_path or settings.CAPTURE_WARM_REPORT
+    if not path or not Path(path).exists():
+        return 0
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+
+    warmed = 0
+    for entry in report.get("top", []):
+        text = entry.get("text")
+        if not text:
+            continue
+        english, _ = to_english(text)
+        if not english:
+            continue
+        generate_answer(english, domain_role=entry.get("role") or "general")
+        warmed += 1
+    return warmed
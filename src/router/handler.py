@@ -1,24 +1,76 @@
 # src/router/handler.py
-from src.translation import translate_text, ENG
-from src.llm_backend import generate_answer
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
 
-def handle_turn(user_text: str, domain_role: str = "general") -> str:
+from src.translation import translate_text, to_english, ENG
+from src.llm_backend import generate_answer_with_tier
+from src.router.capture import record_turn
+from src.router.profiling import start_profiler, write_dump
+
+
+@contextmanager
+def _stage(timings: Dict[str, float], name: str):
+    """Record the wall time of one pipeline stage in milliseconds."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter() - t0) * 1000.0
+
+
+def _run_turn(user_text: str, domain_role: str, timings: Dict[str, float]) -> Tuple[str, str, str]:
+    """Run the pipeline; returns (reply, tier that served it, detected language)."""
+    lang = ENG
     try:
-        # Translate the user's input to English (this also updates the last-user-lang internally)
-        english_text = translate_text(user_text, target_lang=ENG)
+        # Translate the user's input to English, keeping this turn's language
+        with _stage(timings, "translate_in"):
+            english_text, lang = to_english(user_text)
         if not english_text:
-            return "⚠️ Could not translate your input."
+            return "⚠️ Could not translate your input.", "untranslated", lang
 
         # Get an English answer from the LLM
-        english_answer = generate_answer(english_text, domain_role=domain_role)
+        with _stage(timings, "generate"):
+            english_answer, tier = generate_answer_with_tier(english_text, domain_role=domain_role)
         if not english_answer:
-            return "⚠️ The language model did not return a response."
+            return "⚠️ The language model did not return a response.", "empty", lang
 
-        # Translate the answer back to the user's last detected language
-        final = translate_text(english_answer, target_lang=None)
-        return final or english_answer
+        # Translate the answer back to the language detected for this turn
+        with _stage(timings, "translate_out"):
+            final = english_answer if lang == ENG else translate_text(english_answer, target_lang=lang)
+        return final or english_answer, tier, lang
 
     except Exception as e:
-        return f"⚠️ Internal error: {type(e).__name__}"
+        return f"⚠️ Internal error: {type(e).__name__}", "error", lang
 
 
+def handle_turn(user_text: str, domain_role: str = "general", profile: bool = False) -> str:
+    """
+    Run one chat turn. With ``profile=True`` (or when the turn falls in
+    ``PROFILE_SAMPLE_RATE``) a flamegraph-ready dump is written to ``PROFILE_DIR``.
+    With ``CAPTURE_ENABLED`` the turn is also appended to the capture log.
+    """
+    try:
+        profiler = start_profiler(profile)
+    except Exception:
+        profiler = None  # profiling must never break a reply
+    timings: Dict[str, float] = {}
+    lang = ENG
+    started_at = time.time()
+    t0 = time.perf_counter()
+    try:
+        reply, tier, lang = _run_turn(user_text, domain_role, timings)
+    finally:
+        timings["total"] = (time.perf_counter() - t0) * 1000.0
+        if profiler is not None:
+            try:
+                profiler.stop()
+                write_dump(profiler, lang, domain_role, timings)
+            except Exception:
+                pass  # profiling must never break a reply
+
+    try:
+        record_turn(user_text, lang, domain_role, timings, tier, started_at)
+    except Exception:
+        pass  # neither must capture
+    return reply
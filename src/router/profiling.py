@@ -0,0 +1,190 @@
+# src/router/profiling.py
+"""
+Opt-in profiler for single chat turns.
+
+A turn is profiled when the caller asks for it (``profile=True`` / sidebar
+toggle) or when it falls into the sampled fraction ``PROFILE_SAMPLE_RATE``.
+
+Two modes:
+- ``sample``        : a background thread snapshots the turn's stack every
+                      ``PROFILE_INTERVAL_MS`` (low overhead, weights = samples).
+                      Turns shorter than one interval produce an empty dump.
+- ``deterministic`` : ``sys.setprofile`` records every call on the turn's
+                      thread (exact, weights = self time in microseconds).
+
+Output is the collapsed-stack ("folded") format understood by flamegraph.pl,
+inferno and speedscope, one ``frame;frame;frame weight`` line per stack.
+Each ``.folded`` file gets a ``.json`` sidecar with the detected language,
+domain role and stage timings. Only the newest ``PROFILE_MAX_FILES`` dumps
+are kept on disk.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.config.settings import settings
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _fold(frame) -> str:
+    """Collapse a frame chain into ``root;...;leaf``."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class TurnProfiler:
+    """Collects collapsed stacks for the thread that calls ``start()``."""
+
+    def __init__(self, mode: str = "sample", interval_ms: float = 1.0):
+        self.mode = mode if mode in {"sample", "deterministic"} else "sample"
+        self.interval_s = max(float(interval_ms), 0.1) / 1000.0
+        self.stacks: Counter = Counter()
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # deterministic mode: [(folded_stack, start, child_time), ...]
+        self._calls: list = []
+        self._prev_hook = None  # whatever sys.setprofile hook was installed before us
+
+    # ---- lifecycle -----------------------------------------------------------
+    def start(self) -> "TurnProfiler":
+        self._target = threading.get_ident()
+        if self.mode == "deterministic":
+            self._prev_hook = sys.getprofile()
+            sys.setprofile(self._on_event)
+        else:
+            self._thread = threading.Thread(
+                target=self._sample_loop, name="turn-profiler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self.mode == "deterministic":
+            sys.setprofile(self._prev_hook)
+            self._prev_hook = None
+            self._calls.clear()
+        else:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+
+    # ---- sampling ------------------------------------------------------------
+    def _sample_loop(self) -> None:
+        # No sample before the first interval: at that point the turn's thread
+        # is still inside Thread.start() and would only show the profiler itself.
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self._target)
+        if frame is not None:
+            self.stacks[_fold(frame)] += 1
+
+    # ---- deterministic -------------------------------------------------------
+    def _on_event(self, frame, event, arg) -> None:
+        now = time.perf_counter()
+        if event in ("call", "c_call"):
+            if event == "call":
+                name, caller = _frame_name(frame), frame.f_back
+            else:
+                name, caller = f"<c>:{getattr(arg, '__name__', '?')}", frame
+            parent = self._calls[-1][0] if self._calls else _fold(caller)
+            self._calls.append([f"{parent};{name}" if parent else name, now, 0.0])
+        elif event in ("return", "c_return", "c_exception"):
+            if not self._calls:
+                return  # returning out of the frame that started profiling
+            stack, started, child = self._calls.pop()
+            elapsed = now - started
+            self.stacks[stack] += max(int((elapsed - child) * 1e6), 0)
+            if self._calls:
+                self._calls[-1][2] += elapsed
+
+    # ---- output --------------------------------------------------------------
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.items() if n > 0)
+
+
+# ---- Public API -------------------------------------------------------------
+def should_profile(requested: bool = False) -> bool:
+    """True if this turn was explicitly requested or falls in the sampled fraction."""
+    if requested:
+        return True
+    rate = settings.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def start_profiler(requested: bool = False) -> Optional[TurnProfiler]:
+    """Start a profiler for the current turn, or return None if not selected."""
+    if not should_profile(requested):
+        return None
+    return TurnProfiler(settings.PROFILE_MODE, settings.PROFILE_INTERVAL_MS).start()
+
+
+# Only files matching what write_dump() produces are ever rotated away, so
+# PROFILE_DIR can safely be shared with other flamegraph files.
+_DUMP_RE = re.compile(r"^turn-\d{8}-\d{6}-\d{6}-[A-Za-z0-9_-]+\.folded$")
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", value or "").strip("-") or "unknown"
+
+
+def _rotate(directory: Path, max_files: int) -> None:
+    # names start with "turn-<timestamp>", so name order is age order
+    dumps = sorted(p for p in directory.glob("turn-*.folded") if _DUMP_RE.match(p.name))
+    for old in dumps[: max(len(dumps) - max_files, 0)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".json").unlink(missing_ok=True)
+
+
+def write_dump(
+    profiler: TurnProfiler,
+    lang: str,
+    domain_role: str,
+    timings: Dict[str, float],
+    directory: Optional[str] = None,
+    max_files: Optional[int] = None,
+) -> Path:
+    """
+    Write ``turn-<timestamp>-<lang>-<role>.folded`` plus a ``.json`` sidecar with the
+    tags, then drop the oldest dumps beyond ``max_files``. Returns the path.
+    """
+    out_dir = Path(directory or settings.PROFILE_DIR)
+    keep = settings.PROFILE_MAX_FILES if max_files is None else max_files
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1e6) % 1_000_000:06d}"
+    path = out_dir / f"turn-{stamp}-{_slug(lang)}-{_slug(domain_role)}.folded"
+    path.write_text(profiler.folded(), encoding="utf-8")
+
+    meta = {
+        "lang": lang,
+        "domain_role": domain_role,
+        "mode": profiler.mode,
+        "unit": "samples" if profiler.mode == "sample" else "microseconds",
+        "stage_timings_ms": {k: round(v, 3) for k, v in timings.items()},
+        "timestamp": now,
+    }
+    path.with_suffix(".json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    _rotate(out_dir, max(int(keep), 1))
+    return path
@@ -0,0 +1,114 @@
+# src/router/replay.py
+"""
+Replay captured traffic against the pipeline, or summarize it.
+
+    # re-run a capture at 2x the original pace with 4 concurrent "users"
+    python -m src.router.replay run --capture captures/turns.jsonl --speed 2 --workers 4
+
+    # frequency report; point CAPTURE_WARM_REPORT at it to pre-warm caches on startup
+    python -m src.router.replay report --capture captures/turns.jsonl --out captures/warm.json
+
+``--speed 0`` replays as fast as possible. Only records captured with
+``CAPTURE_STORE_TEXT`` can be replayed; hash-only records are counted and
+skipped. Each turn keeps its own detected language, so ``--workers > 1``
+preserves the original language mix. Disable ``CAPTURE_ENABLED`` while
+replaying unless you want the replayed turns captured too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from src.router.capture import frequency_report, read_capture
+from src.router.handler import handle_turn
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100.0), len(values) - 1)]
+
+
+def replay(records: List[dict], speed: float = 1.0, workers: int = 1) -> dict:
+    """
+    Re-issue captured turns through ``handle_turn``, keeping the original
+    inter-arrival gaps divided by ``speed``. Returns latency stats in ms.
+    """
+    # Turns are logged when they finish, so overlapping sessions leave the
+    # file out of start-time order; schedule by ``ts`` instead.
+    playable = sorted((r for r in records if r.get("text")), key=lambda r: r.get("ts", 0.0))
+    skipped = len(records) - len(playable)
+    if not playable:
+        return {"replayed": 0, "skipped": skipped}
+
+    def run_one(rec: dict) -> float:
+        t0 = time.perf_counter()
+        handle_turn(rec["text"], domain_role=rec.get("role") or "general")
+        return (time.perf_counter() - t0) * 1000.0
+
+    first_ts = playable[0].get("ts", 0.0)  # smallest ts after sorting
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = []
+        for rec in playable:
+            if speed > 0:
+                due = (rec.get("ts", first_ts) - first_ts) / speed
+                delay = due - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append(pool.submit(run_one, rec))
+        latencies = [f.result() for f in futures]
+    wall = time.perf_counter() - start
+
+    return {
+        "replayed": len(latencies),
+        "skipped": skipped,
+        "wall_s": round(wall, 3),
+        "turns_per_s": round(len(latencies) / wall, 2) if wall > 0 else None,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "max_ms": round(max(latencies), 3),
+        "langs": dict(Counter(r.get("lang", "") for r in playable).most_common()),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="replay a capture against the pipeline")
+    run.add_argument("--capture", default=None, help="capture file (default: CAPTURE_PATH)")
+    run.add_argument("--speed", type=float, default=1.0, help="1 = original pace, 0 = no delays")
+    run.add_argument("--workers", type=int, default=1)
+    run.add_argument("--limit", type=int, default=0, help="replay only the first N records")
+
+    rep = sub.add_parser("report", help="write a frequency report")
+    rep.add_argument("--capture", default=None, help="capture file (default: CAPTURE_PATH)")
+    rep.add_argument("--out", default=None, help="write JSON here instead of stdout")
+    rep.add_argument("--top", type=int, default=200)
+
+    args = ap.parse_args()
+    records = list(read_capture(args.capture))
+
+    if args.cmd == "run":
+        if args.limit:
+            records = records[: args.limit]
+        result = replay(records, speed=args.speed, workers=args.workers)
+    else:
+        result = frequency_report(records, top=args.top)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            print(f"wrote {args.out} ({result['turns']} turns, {len(result['top'])} top texts)")
+            return
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
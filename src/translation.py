@@ -178,6 +178,21 @@ def _lang_to_en(text: str, src_lang: str) -> str:
 
 
 # ---- Public API -------------------------------------------------------------
+def to_english(text: str) -> tuple[str, str]:
+    """
+    Detect the language of `text` and translate it to English.
+    Returns (english_text, detected_code). Unlike translate_text(), this does
+    not touch the per-process last-user-lang, so concurrent turns can each
+    keep their own language.
+    """
+    if not text or not text.strip():
+        return text, ENG
+    src_code = _code_from_detect(text)
+    if src_code == ENG:
+        return text, ENG
+    return _lang_to_en(text, src_code), src_code
+
+
 def translate_text(text: str, target_lang: Optional[str] = None) -> str:
     """
     Translate text between English and supported Indic languages.
@@ -196,12 +211,10 @@ def translate_text(text: str, target_lang: Optional[str] = None) -> str:
 
     # 1) To English
     if target_lang == ENG:
-        src_code = _code_from_detect(text)
+        english, src_code = to_english(text)
         # Remember user's language for the return trip
         _last_user_lang = src_code
-        if src_code == ENG:
-            return text
-        return _lang_to_en(text, src_code)
+        return english
 
     # 2) Translate back to the last user's language (if any)
     if target_lang is None:
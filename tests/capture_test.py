@@ -0,0 +1,138 @@
+# tests/capture_test.py
+import dataclasses
+import importlib
+import json
+import logging
+import sys
+from collections import OrderedDict
+
+import pytest
+
+from src import llm_backend
+from src import router as router_pkg
+from src.config.settings import settings
+from src.router import capture
+from src.router.capture import capture_files, frequency_report, scrub, text_hash
+from src.router.handler import handle_turn
+
+
+def test_scrub_replaces_emails_urls_and_numbers():
+    text = "mail  a.b@example.com, see https://x.io/p or call +91 98765 43210"
+    assert scrub(text) == "mail <email>, see <url> or call <num>"
+
+
+def test_text_hash_matches_after_scrubbing():
+    assert text_hash("Call me on 98765 43210") == text_hash("call me on 91234 56789")
+    assert text_hash("hello") != text_hash("goodbye")
+
+
+def test_capture_files_oldest_first(tmp_path):
+    base = tmp_path / "turns.jsonl"
+    for name in ("turns.jsonl", "turns.jsonl.1", "turns.jsonl.2", "turns.jsonl.10"):
+        (tmp_path / name).write_text("")
+
+    assert [p.name for p in capture_files(str(base))] == [
+        "turns.jsonl.10",
+        "turns.jsonl.2",
+        "turns.jsonl.1",
+        "turns.jsonl",
+    ]
+
+
+def test_frequency_report_aggregates():
+    records = [
+        {"h": "a", "k": "k1", "lang": "hin_Deva", "role": "general", "tier": "rules", "ms": {"total": 2.0}, "text": "x"},
+        {"h": "a", "k": "k1", "lang": "hin_Deva", "role": "general", "tier": "cache", "ms": {"total": 4.0}},
+        {"h": "b", "k": "k1", "lang": "eng_Latn", "role": "technical", "tier": "model", "ms": {"total": 6.0}},
+    ]
+
+    report = frequency_report(records, top=1)
+
+    assert report["turns"] == 3
+    assert report["unique_texts"] == 2
+    assert report["langs"] == {"hin_Deva": 2, "eng_Latn": 1}
+    assert report["tiers"] == {"rules": 1, "cache": 1, "model": 1}
+    assert report["hash_keys"] == {"k1": 3}
+    assert report["mean_stage_ms"] == {"total": 4.0}
+    assert report["top"] == [
+        {"h": "a", "k": "k1", "count": 2, "text": "x", "lang": "hin_Deva", "role": "general"}
+    ]
+
+
+def test_frequency_report_does_not_merge_hash_keys():
+    records = [{"h": "a", "k": "k1"}, {"h": "a", "k": "k2"}]
+
+    report = frequency_report(records)
+
+    assert report["unique_texts"] == 2
+    assert report["hash_keys"] == {"k1": 1, "k2": 1}
+
+
+@pytest.fixture
+def capture_on(tmp_path, monkeypatch):
+    cfg = dataclasses.replace(
+        settings, CAPTURE_ENABLED=True, CAPTURE_PATH=str(tmp_path / "turns.jsonl"), CAPTURE_HASH_KEY="test-key"
+    )
+    monkeypatch.setattr(capture, "settings", cfg)
+    monkeypatch.setattr(llm_backend, "_answer_cache", OrderedDict())
+    yield tmp_path / "turns.jsonl"
+    for h in list(logging.getLogger(capture._CAPTURE_LOGGER).handlers):
+        h.close()
+
+
+def test_handle_turn_records_one_scrubbed_line(capture_on):
+    handle_turn("What is the capital of Japan? mail me at a@b.com", domain_role="technical")
+
+    lines = capture_on.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    rec = json.loads(lines[0])
+    assert rec["lang"] == "eng_Latn"
+    assert rec["role"] == "technical"
+    assert rec["tier"] == "rules"
+    assert {"translate_in", "generate", "translate_out", "total"} <= set(rec["ms"])
+    assert rec["h"] == text_hash("what is the capital of japan? mail me at x@y.org")
+    assert "text" not in rec
+    assert "a@b.com" not in lines[0]
+
+
+def test_reimported_module_reuses_logger_and_key(capture_on, monkeypatch):
+    cfg = dataclasses.replace(capture.settings, CAPTURE_HASH_KEY="")
+    monkeypatch.setattr(capture, "settings", cfg)
+    before = capture.text_hash("hello")
+    capture.record_turn("hello", "eng_Latn", "general", {}, "rules", 0.0)
+
+    # Simulate Streamlit re-importing an edited module (undone at teardown)
+    monkeypatch.delitem(sys.modules, "src.router.capture")
+    monkeypatch.setattr(router_pkg, "capture", capture)
+    fresh = importlib.import_module("src.router.capture")
+    monkeypatch.setattr(fresh, "settings", cfg)
+    fresh.record_turn("hello", "eng_Latn", "general", {}, "rules", 0.0)
+
+    assert fresh.text_hash("hello") == before
+    assert len(logging.getLogger(fresh._CAPTURE_LOGGER).handlers) == 1
+    assert len(capture_on.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_warm_caches_fills_answer_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_backend, "_answer_cache", OrderedDict())
+    report = tmp_path / "warm.json"
+    report.write_text(json.dumps({"top": [
+        {"h": "a", "count": 3, "text": "what is the capital of france", "role": "general"},
+        {"h": "b", "count": 1},  # hash-only: skipped
+    ]}), encoding="utf-8")
+
+    assert capture.warm_caches(str(report)) == 1
+    assert llm_backend.generate_answer_with_tier("what is the capital of france") == ("Paris", "cache")
+
+
+def test_missing_hash_key_warns_once_and_tags_records(capture_on, monkeypatch, caplog):
+    monkeypatch.setattr(capture, "settings", dataclasses.replace(capture.settings, CAPTURE_HASH_KEY=""))
+    monkeypatch.delattr(logging.getLogger(capture._CAPTURE_LOGGER), "guvi_key_warned", raising=False)
+
+    with caplog.at_level(logging.WARNING, logger=capture.__name__):
+        capture.record_turn("hello", "eng_Latn", "general", {}, "rules", 0.0)
+        capture.record_turn("hello", "eng_Latn", "general", {}, "rules", 0.0)
+
+    assert sum("CAPTURE_HASH_KEY" in r.getMessage() for r in caplog.records) == 1
+    recs = [json.loads(line) for line in capture_on.read_text(encoding="utf-8").splitlines()]
+    assert {r["k"] for r in recs} == {capture.key_id()}
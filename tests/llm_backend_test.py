@@ -0,0 +1,34 @@
+# tests/llm_backend_test.py
+from collections import OrderedDict
+
+import pytest
+
+from src import llm_backend
+from src.llm_backend import generate_answer, generate_answer_with_tier
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(llm_backend, "_answer_cache", OrderedDict())
+
+
+def test_rules_tier_then_cache():
+    assert generate_answer_with_tier("What is the capital of Japan?") == ("Tokyo", "rules")
+    assert generate_answer_with_tier("What is the capital of Japan?") == ("Tokyo", "cache")
+
+
+def test_model_tier_then_cache():
+    answer, tier = generate_answer_with_tier("tell me a joke", domain_role="friendly")
+    assert tier == "model"
+    assert generate_answer_with_tier("tell me a joke", domain_role="friendly") == (answer, "cache")
+    # the role is part of the cache key
+    assert generate_answer_with_tier("tell me a joke", domain_role="technical")[1] == "model"
+
+
+def test_error_tier(monkeypatch):
+    def boom(prompt_en, domain_role):
+        raise ValueError("bad")
+
+    monkeypatch.setattr(llm_backend, "_generate_uncached", boom)
+    assert generate_answer_with_tier("anything") == ("[LLM error: ValueError]", "error")
+    assert generate_answer("anything") == "[LLM error: ValueError]"
@@ -0,0 +1,83 @@
+# tests/profiling_test.py
+import dataclasses
+import json
+import sys
+
+from src.config.settings import settings
+from src.router import handler, profiling
+from src.router.profiling import TurnProfiler, _rotate, write_dump
+
+
+def test_folded_format():
+    p = TurnProfiler()
+    p.stacks["app.py:main;handler.py:handle_turn"] += 3
+    p.stacks["app.py:main"] += 0  # zero-weight stacks are dropped
+    assert p.folded() == "app.py:main;handler.py:handle_turn 3\n"
+
+
+def test_rotate_keeps_newest_and_removes_sidecars(tmp_path):
+    for i in range(5):
+        (tmp_path / f"turn-2026010{i}-120000-000000-eng_Latn-general.folded").write_text("a 1\n")
+        (tmp_path / f"turn-2026010{i}-120000-000000-eng_Latn-general.json").write_text("{}")
+
+    _rotate(tmp_path, 2)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "turn-20260103-120000-000000-eng_Latn-general.folded",
+        "turn-20260103-120000-000000-eng_Latn-general.json",
+        "turn-20260104-120000-000000-eng_Latn-general.folded",
+        "turn-20260104-120000-000000-eng_Latn-general.json",
+    ]
+
+
+def test_rotate_leaves_foreign_files_alone(tmp_path):
+    (tmp_path / "20200101-other.folded").write_text("a 1\n")
+    (tmp_path / "20200101-other.json").write_text("{}")
+    (tmp_path / "turn-notes.folded").write_text("a 1\n")
+    (tmp_path / "turn-20260101-120000-000000-eng_Latn-general.folded").write_text("a 1\n")
+
+    _rotate(tmp_path, 1)
+
+    assert len(list(tmp_path.iterdir())) == 4
+
+
+def test_deterministic_turn_writes_dump_and_unhooks(tmp_path, monkeypatch):
+    cfg = dataclasses.replace(settings, PROFILE_MODE="deterministic", PROFILE_DIR=str(tmp_path))
+    monkeypatch.setattr(profiling, "settings", cfg)
+
+    handler.handle_turn("what is the capital of japan", domain_role="technical", profile=True)
+
+    assert sys.getprofile() is None
+    dumps = list(tmp_path.glob("*.folded"))
+    assert len(dumps) == 1
+    assert "handler.py:_run_turn" in dumps[0].read_text(encoding="utf-8")
+    meta = json.loads(dumps[0].with_suffix(".json").read_text(encoding="utf-8"))
+    assert meta["domain_role"] == "technical"
+    assert meta["unit"] == "microseconds"
+    assert {"translate_in", "generate", "translate_out", "total"} <= set(meta["stage_timings_ms"])
+
+
+def test_write_dump_names_file_after_lang_and_role(tmp_path):
+    path = write_dump(TurnProfiler(), "hin_Deva", "tech/ops", {}, directory=str(tmp_path))
+    assert path.name.startswith("turn-")
+    assert path.name.endswith("-hin_Deva-tech-ops.folded")
+
+
+def test_deterministic_mode_restores_previous_hook():
+    def hook(frame, event, arg):
+        pass
+
+    sys.setprofile(hook)
+    try:
+        TurnProfiler("deterministic").start().stop()
+        assert sys.getprofile() is hook
+    finally:
+        sys.setprofile(None)
+
+
+def test_profiler_start_failure_does_not_break_reply(monkeypatch):
+    def boom(requested=False):
+        raise RuntimeError("can't start thread")
+
+    monkeypatch.setattr(handler, "start_profiler", boom)
+    assert handler.handle_turn("what is the capital of japan", profile=True) == "Tokyo"
@@ -0,0 +1,38 @@
+# tests/replay_test.py
+from src.router import replay as replay_mod
+
+
+def test_replay_skips_hash_only_records(monkeypatch):
+    seen = []
+    monkeypatch.setattr(replay_mod, "handle_turn", lambda text, domain_role: seen.append((text, domain_role)))
+    records = [
+        {"ts": 100.0, "h": "a", "lang": "eng_Latn", "role": "general", "text": "hello"},
+        {"ts": 101.0, "h": "b", "lang": "eng_Latn", "role": "general"},
+        {"ts": 500.0, "h": "c", "lang": "hin_Deva", "role": "technical", "text": "नमस्ते"},
+    ]
+
+    result = replay_mod.replay(records, speed=0)
+
+    assert seen == [("hello", "general"), ("नमस्ते", "technical")]
+    assert result["replayed"] == 2
+    assert result["skipped"] == 1
+    assert result["langs"] == {"eng_Latn": 1, "hin_Deva": 1}
+
+
+def test_replay_with_only_hash_records():
+    assert replay_mod.replay([{"h": "a"}], speed=0) == {"replayed": 0, "skipped": 1}
+
+
+def test_replay_schedules_by_ts_not_file_order(monkeypatch):
+    seen = []
+    monkeypatch.setattr(replay_mod, "handle_turn", lambda text, domain_role: seen.append(text))
+    # logged at turn end, so a long first turn lands after a short second one
+    records = [
+        {"ts": 100.2, "h": "b", "text": "second"},
+        {"ts": 100.0, "h": "a", "text": "first"},
+    ]
+
+    result = replay_mod.replay(records, speed=1.0)
+
+    assert seen == ["first", "second"]
+    assert 0.15 <= result["wall_s"] < 1.0
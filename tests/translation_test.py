@@ -0,0 +1,19 @@
+# tests/translation_test.py
+from src import translation
+from src.translation import ENG, HIN, TAM, to_english
+
+
+def test_to_english_leaves_last_user_lang_alone(monkeypatch):
+    monkeypatch.setattr(translation, "_last_user_lang", TAM)
+    monkeypatch.setattr(translation, "_code_from_detect", lambda text: HIN)
+
+    assert to_english("नमस्ते") == ("hello", HIN)
+    assert translation.get_last_user_lang() == TAM
+
+    monkeypatch.setattr(translation, "_code_from_detect", lambda text: ENG)
+    assert to_english("hello there") == ("hello there", ENG)
+    assert translation.get_last_user_lang() == TAM
+
+
+def test_to_english_empty_text():
+    assert to_english("  ") == ("  ", ENG)